@@ -2,13 +2,19 @@ import sys
 import os
 import re
 import shutil
+import time
+import argparse
+import csv
+import json
+import copy
+from urllib.parse import urlsplit, urlunsplit, parse_qs
 
 import yt_dlp
 from PySide2.QtCore import Qt, QThread, Signal, QSettings
 from PySide2.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                                QPlainTextEdit, QLabel, QPushButton, QLineEdit,
                                QFileDialog, QComboBox, QCheckBox, QMessageBox,
-                               QProgressDialog)
+                               QProgressDialog, QSpinBox)
 
 
 class YtbLogger(object):
@@ -32,34 +38,52 @@ class YtbInfo(QThread):
         "quiet": True,
     }
 
-    def __init__(self, url):
+    NEWEST_FIRST = re.compile(
+        r"https?://(www\.|m\.)?youtube\.com/(@|channel/|c/|user/)[^/?#]+/(videos|shorts|streams)"
+    )
+
+    def __init__(self, url, known_ids=None):
         super(YtbInfo, self).__init__()
 
         self.url = url
+        self.known_ids = known_ids
+        self.newest_first = False
         self.ext_url = None
 
         self.title = None
         self.id = None
+        self.duration = None
+        self.filesize = None
+        self.info_dict = None
 
         self.entry_titles = []
         self.entry_ids = []
+        self.entry_durations = []
 
         self.start()
 
     def run(self):
         try:
             with yt_dlp.YoutubeDL(YtbInfo.OPTS) as ydl:
-                result = ydl.extract_info(self.url, download=False)
+                if self.known_ids is None:
+                    result = ydl.extract_info(self.url, download=False)
+                else:
+                    result = self.extract_new_info(ydl)
         except:
             pass
         else:
             self.set_ext_url(result.get("extractor"))
             self.title = result.get("title")
+            self.duration = result.get("duration")
+            self.filesize = result.get("filesize") or result.get("filesize_approx")
+            if "formats" in result:
+                self.info_dict = result
 
             if "entries" in result and self.ext_url:
                 for entry in result["entries"]:
                     self.entry_ids.append(entry.get("id"))
                     self.entry_titles.append(entry.get("title"))
+                    self.entry_durations.append(entry.get("duration"))
 
                 if None in self.entry_ids:
                     self.id = result.get("id")
@@ -74,10 +98,34 @@ class YtbInfo(QThread):
                         info.wait()
 
                     self.entry_titles = [info.title for info in info_list]
+                    self.entry_durations = [info.duration for info in info_list]
 
             else:
                 self.id = result.get("id")
 
+    def extract_new_info(self, ydl):
+        result = ydl.extract_info(self.url, download=False, process=False)
+
+        while result.get("_type") in ["url", "url_transparent"]:
+            result = ydl.extract_info(result["url"], download=False, process=False)
+
+        webpage_url = result.get("webpage_url") or result.get("url") or ""
+        self.newest_first = bool(YtbInfo.NEWEST_FIRST.match(webpage_url))
+
+        if "entries" in result:
+            entries = []
+
+            for entry in result["entries"]:
+                if entry.get("id") in self.known_ids:
+                    if self.newest_first:
+                        break
+                    continue
+                entries.append(entry)
+
+            result["entries"] = entries
+
+        return result
+
     def set_ext_url(self, extractor):
         if not extractor:
             return
@@ -88,6 +136,201 @@ class YtbInfo(QThread):
         elif extractor.startswith("vimeo"):
             self.ext_url = "https://vimeo.com/"
 
+    def cost(self):
+        if self.id or (not self.ext_url):
+            return self.duration, self.filesize
+
+        if (not self.entry_durations) or (None in self.entry_durations):
+            return None, None
+
+        return sum(self.entry_durations), None
+
+
+class YtbImport(object):
+
+    BATCH_SIZE = 50
+
+    SCHEMES = [
+        "http",
+        "https",
+    ]
+
+    YOUTUBE_HOSTS = [
+        "youtube.com",
+        "www.youtube.com",
+        "m.youtube.com",
+        "music.youtube.com",
+        "youtu.be",
+    ]
+
+    YOUTUBE_WWW_HOSTS = [
+        "youtube.com",
+        "m.youtube.com",
+    ]
+
+    BARE_HOSTS = YOUTUBE_HOSTS + [
+        "vimeo.com",
+        "www.vimeo.com",
+    ]
+
+    YOUTUBE_ID = re.compile(r"[\w-]{11}")
+
+    HOST_LABEL = re.compile(r"[a-z0-9]([a-z0-9-]{0,61}[a-z0-9])?")
+
+    TLD = re.compile(r"([a-z]{2,63}|xn--[a-z0-9-]{1,59})")
+
+    def __init__(self, path, seen=None):
+        self.path = path
+        self.seen = set() if seen is None else seen
+
+        self.count = 0
+        self.invalid = 0
+        self.duplicate = 0
+
+    def __iter__(self):
+        batch = []
+
+        for url in self.iter_urls():
+            batch.append(url)
+
+            if len(batch) == YtbImport.BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def iter_urls(self):
+        for text in self.iter_text():
+            url = YtbImport.normalize(text)
+
+            if not url:
+                self.invalid += 1
+                continue
+
+            if url in self.seen:
+                self.duplicate += 1
+                continue
+
+            self.seen.add(url)
+            self.count += 1
+            yield url
+
+    def iter_text(self):
+        ext = os.path.splitext(self.path)[1].lower()
+
+        with open(self.path, encoding="utf-8", errors="replace", newline="") as f:
+            if ext == ".csv":
+                column = None
+
+                for i, row in enumerate(csv.reader(f)):
+                    cells = [cell.strip() for cell in row]
+
+                    if i == 0 and "url" in [cell.lower() for cell in cells]:
+                        column = [cell.lower() for cell in cells].index("url")
+                        continue
+
+                    if column is not None:
+                        yield cells[column] if column < len(cells) else ""
+                        continue
+
+                    urls = [cell for cell in cells if YtbImport.has_scheme(cell)]
+                    urls += [cell for cell in cells if YtbImport.normalize(cell)]
+                    yield urls[0] if urls else ",".join(row)
+
+            elif ext in [".jsonl", ".ndjson"]:
+                for line in f:
+                    if not line.strip():
+                        continue
+
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        item = ""
+
+                    if isinstance(item, dict):
+                        item = item.get("url") or item.get("webpage_url") or ""
+
+                    yield item if isinstance(item, str) else ""
+
+            else:
+                for line in f:
+                    for text in line.split():
+                        yield text
+
+    @staticmethod
+    def normalize(url):
+        url = url.strip()
+
+        if not url:
+            return None
+
+        bare = not YtbImport.has_scheme(url)
+
+        if bare:
+            url = "https://" + url
+
+        try:
+            parts = urlsplit(url)
+            host = parts.hostname
+            port = parts.port
+        except ValueError:
+            return None
+
+        scheme = parts.scheme.lower()
+
+        if scheme not in YtbImport.SCHEMES or not YtbImport.is_valid_host(host):
+            return None
+
+        if bare and host not in YtbImport.BARE_HOSTS:
+            return None
+
+        if host in YtbImport.YOUTUBE_HOSTS:
+            query = parse_qs(parts.query)
+            video_id = None
+
+            if host == "youtu.be" or parts.path in ["", "/"]:
+                video_id = parts.path[1:]
+            elif parts.path == "/watch":
+                video_id = query.get("v", [""])[0]
+            elif parts.path.startswith("/shorts/"):
+                video_id = parts.path[len("/shorts/"):]
+
+            if video_id is not None and not YtbImport.YOUTUBE_ID.fullmatch(video_id):
+                if "list" not in query:
+                    return None
+
+            elif video_id and "list" not in query:
+                return "https://youtu.be/" + video_id
+
+        if host in YtbImport.YOUTUBE_WWW_HOSTS:
+            host = "www.youtube.com"
+
+        netloc = host
+        if port is not None:
+            netloc += ":{}".format(port)
+
+        if "@" in parts.netloc:
+            netloc = parts.netloc.rpartition("@")[0] + "@" + netloc
+
+        return urlunsplit((scheme, netloc, parts.path, parts.query, ""))
+
+    @staticmethod
+    def has_scheme(text):
+        return text.lower().startswith(("http://", "https://"))
+
+    @staticmethod
+    def is_valid_host(host):
+        if not host:
+            return False
+
+        labels = host.split(".")
+
+        if len(labels) < 2 or not YtbImport.TLD.fullmatch(labels[-1]):
+            return False
+
+        return all(YtbImport.HOST_LABEL.fullmatch(label) for label in labels)
+
 
 class YtbDl(QThread):
 
@@ -129,6 +372,33 @@ class YtbDl(QThread):
         "360p": "640",
     }
 
+    SCHEDULE = [
+        "fifo",
+        "shortest_first",
+        "priority",
+    ]
+
+    PIN_MARK = "*"
+
+    TRANSCODE_CPU_RATE = 0.02
+
+    SYNC_STATE_LEN = 100
+
+    BITRATE = {
+        "3840": 16000,
+        "2560": 9000,
+        "1920": 4500,
+        "1280": 2500,
+        "854": 1200,
+        "640": 700,
+    }
+
+    AUDIO_BITRATE = 160
+
+    SCRATCH_FACTOR = 2
+
+    NOMINAL_DURATION = 3600
+
     prog_signal = Signal(dict)
 
     def __init__(self):
@@ -136,6 +406,27 @@ class YtbDl(QThread):
 
         self.output_path = ""
         self.url_list = []
+        self.import_paths = []
+        self.imports = []
+
+        self.schedule = "fifo"
+        self.pinned = []
+        self.completion_times = []
+        self.completion_order = []
+
+        self.sync = False
+        self.sync_state = {}
+
+        self.reserve = 1024**3
+        self.skipped = []
+        self.skipped_len = 0
+        self.job_sizes = {}
+        self.total_bytes = 0
+        self.remaining_bytes = 0
+
+        self.info = {}
+        self.plans = []
+        self.pp_time = 0
 
         self.ytb_info = {}
         self.info_tmp = []
@@ -153,11 +444,41 @@ class YtbDl(QThread):
         ytb_info_keys = list(self.ytb_info.keys())
         for url in self.url_list:
             if url not in ytb_info_keys:
-                self.ytb_info[url] = YtbInfo(url)
+                self.ytb_info[url] = YtbInfo(url, self.get_known_ids(url))
+
+    def set_sync(self, sync):
+        self.sync = sync
+
+        while self.ytb_info:
+            self.info_tmp.append(self.ytb_info.popitem()[1])
+
+        self.set_ytb_info(self.url_list)
+
+    def get_known_ids(self, url):
+        if not self.sync:
+            return None
+
+        return set(self.sync_state.get(url, []))
+
+    def update_sync_state(self, url, info):
+        if not self.sync:
+            return
+
+        entry_ids = set(info.entry_ids)
+        known_ids = [i for i in self.sync_state.get(url, []) if i not in entry_ids]
+        sync_ids = info.entry_ids + known_ids
+
+        if info.newest_first:
+            sync_ids = sync_ids[:YtbDl.SYNC_STATE_LEN]
+
+        self.sync_state[url] = sync_ids
 
     def set_opts(self, **info):
+        self.info = info
+
         self.opts = {
             "progress_hooks": [self.hook],
+            "postprocessor_hooks": [self.pp_hook],
             "no_warnings": True,
             "quiet": True,
         }
@@ -238,6 +559,291 @@ class YtbDl(QThread):
 
         self.opts["format"] = "/".join(fmt_opts)
 
+    def plan(self, result):
+        formats = result.get("formats")
+        out_fmt = self.info.get("output_format")
+
+        if (not formats) or (out_fmt not in YtbDl.OUTPUT_FORMAT[1:]):
+            return self.opts, None, False
+
+        opts = dict(self.opts)
+        fmt_opts = opts["format"].split("/")
+
+        if out_fmt == "audio_only":
+            action, avoided = self.plan_audio(formats, fmt_opts, opts)
+        else:
+            action, avoided = self.plan_video(formats, fmt_opts, opts), False
+
+        opts["format"] = "/".join(fmt_opts)
+
+        return opts, action, avoided
+
+    def plan_audio(self, formats, fmt_opts, opts):
+        a_fmt = self.info.get("audio")
+        audio_formats = [f for f in formats if f.get("vcodec") == "none"]
+        acodecs = [f.get("acodec") or "" for f in audio_formats]
+
+        if a_fmt == "mp3":
+            if any(acodec.startswith("mp3") for acodec in acodecs):
+                fmt_opts.insert(0, "bestaudio[acodec^=mp3]")
+                return "copy", True
+
+            return "transcode", False
+
+        if a_fmt == "ogg":
+            if any(f.get("ext") == "webm" and "opus" in (f.get("acodec") or "")
+                   for f in audio_formats):
+                return "copy", False
+
+            for acodec in ["vorbis", "opus"]:
+                if acodec in acodecs:
+                    fmt_opts.insert(1, "bestaudio[acodec={}]".format(acodec))
+                    return "copy", acodec == "vorbis"
+
+            opts.pop("postprocessor_args", None)
+            return "transcode", False
+
+        return "direct", False
+
+    def plan_video(self, formats, fmt_opts, opts):
+        width = int(self.info.get("width"))
+
+        if self.info.get("video") != "mp4" or self.info.get("hdr"):
+            return "copy"
+
+        split_width = 0
+        muxed = []
+
+        for f in formats:
+            f_width = f.get("width") or 0
+            vcodec = f.get("vcodec") or "none"
+            acodec = f.get("acodec") or "none"
+
+            if f.get("ext") != "mp4" or vcodec == "none" or f_width > width:
+                continue
+
+            if acodec == "none":
+                if not vcodec.startswith("av01"):
+                    split_width = max(split_width, f_width)
+            else:
+                muxed.append(f)
+
+        muxed = [f for f in muxed if (f.get("width") or 0) >= split_width]
+
+        if not muxed:
+            return "copy"
+
+        best = max(muxed, key=lambda f: ((f.get("width") or 0), (f.get("tbr") or 0)))
+        fmt_opts.insert(0, best["format_id"])
+
+        return "direct"
+
+    def download(self, url):
+        cpu_time = self.get_cpu_time()
+        action = None
+
+        try:
+            with yt_dlp.YoutubeDL(self.opts) as ydl:
+                result = ydl.extract_info(url, download=False, process=False)
+
+            opts, action, avoided = self.plan(result)
+
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                ydl.process_ie_result(result, download=True)
+        except:
+            action = None
+            self.opts["format"] = "best"
+            with yt_dlp.YoutubeDL(self.opts) as ydl:
+                ydl.download([url])
+
+        if not action:
+            return
+
+        plan = {
+            "title": result.get("title") or url,
+            "action": action,
+            "duration": result.get("duration"),
+            "cpu": self.get_cpu_time() - cpu_time,
+            "avoided": avoided,
+        }
+        self.plans.append(plan)
+
+    def get_cpu_time(self):
+        if os.name == "nt":
+            return self.pp_time
+
+        times = os.times()
+        return times.children_user + times.children_system
+
+    def transcode_cpu_rate(self):
+        rates = [plan["cpu"] / plan["duration"] for plan in self.plans
+                 if plan["action"] == "transcode" and plan["duration"]]
+
+        if not rates:
+            return YtbDl.TRANSCODE_CPU_RATE
+
+        return sum(rates) / len(rates)
+
+    def cpu_time_saved(self):
+        rate = self.transcode_cpu_rate()
+        saved = 0
+
+        for plan in self.plans:
+            if plan["avoided"] and plan["duration"]:
+                saved += max(plan["duration"] * rate - plan["cpu"], 0)
+
+        return saved
+
+    def estimate_jobs(self, url_list, ytb_info):
+        for url in url_list:
+            if not ytb_info[url].title:
+                continue
+
+            sizes = self.estimate_job(ytb_info[url])
+            size = sum(size for size in sizes if size)
+
+            self.job_sizes[url] = sizes
+            self.total_bytes += size
+            self.remaining_bytes += size
+
+    def estimate_job(self, info):
+        if info.id or (not info.ext_url):
+            return [self.estimate_size(info.info_dict, info.duration)]
+
+        return [self.estimate_size(None, duration) for duration in info.entry_durations]
+
+    def estimate_size(self, info_dict, duration):
+        if info_dict:
+            opts = self.plan(info_dict)[0]
+
+            try:
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    result = ydl.process_ie_result(copy.deepcopy(info_dict), download=False)
+            except yt_dlp.utils.YoutubeDLError:
+                result = None
+
+            if result:
+                size = YtbDl.get_format_size(result, duration)
+                if size:
+                    return size
+
+        if not duration:
+            return None
+
+        return int(duration * self.get_bitrate() * 125)
+
+    def get_bitrate(self):
+        if self.info.get("output_format") == "audio_only":
+            return YtbDl.AUDIO_BITRATE
+
+        return YtbDl.BITRATE.get(self.info.get("width"), YtbDl.BITRATE["1280"])
+
+    @staticmethod
+    def get_format_size(fmt, duration):
+        size = 0
+
+        for f in fmt.get("requested_formats") or [fmt]:
+            f_size = f.get("filesize") or f.get("filesize_approx")
+
+            if (not f_size) and f.get("tbr") and duration:
+                f_size = f["tbr"] * duration * 125
+
+            if not f_size:
+                return None
+
+            size += f_size
+
+        return int(size)
+
+    @staticmethod
+    def format_bytes(size):
+        for unit in ["B", "KB", "MB", "GB"]:
+            if size < 1024:
+                return "{:.1f}{}".format(size, unit)
+            size /= 1024
+
+        return "{:.1f}TB".format(size)
+
+    def check_space(self, size):
+        if size is None:
+            size = YtbDl.NOMINAL_DURATION * self.get_bitrate() * 125
+
+        try:
+            free = shutil.disk_usage(self.output_path or os.curdir).free
+        except OSError as e:
+            return "free space unknown: {}".format(e)
+
+        if free - size * YtbDl.SCRATCH_FACTOR < self.reserve:
+            return "low disk space"
+
+        return None
+
+    def download_admitted(self, url, size):
+        reason = self.check_space(size)
+        admitted = reason is None
+
+        if admitted:
+            self.download(url)
+        else:
+            self.skipped.append("{}  ({})".format(url, reason))
+
+        self.remaining_bytes = max(self.remaining_bytes - (size or 0), 0)
+
+        return admitted
+
+    def get_size_info(self, downloaded=0):
+        remaining = max(self.remaining_bytes - downloaded, 0)
+
+        return "batch size: ~{} ({} remaining)".format(
+            YtbDl.format_bytes(self.total_bytes), YtbDl.format_bytes(remaining)
+        )
+
+    def schedule_jobs(self, url_list, ytb_info):
+        jobs = list(url_list)
+
+        if self.schedule == "shortest_first":
+            jobs.sort(key=lambda url: self.job_cost(ytb_info[url]))
+
+        elif self.schedule == "priority":
+            jobs.sort(key=lambda url: url not in self.pinned)
+
+        return jobs
+
+    def job_cost(self, info):
+        duration, filesize = info.cost()
+
+        if duration is None:
+            duration = float("inf")
+
+        if filesize is None:
+            filesize = float("inf")
+
+        return duration, filesize
+
+    def mean_completion_time(self):
+        if not self.completion_times:
+            return None
+
+        return sum(self.completion_times) / len(self.completion_times)
+
+    def fifo_mean_completion_time(self):
+        if not self.completion_times:
+            return None
+
+        durations = {}
+        previous = 0
+        for position, completion_time in zip(self.completion_order, self.completion_times):
+            durations[position] = completion_time - previous
+            previous = completion_time
+
+        fifo_times = []
+        elapsed = 0
+        for position in sorted(durations):
+            elapsed += durations[position]
+            fifo_times.append(elapsed)
+
+        return sum(fifo_times) / len(fifo_times)
+
     def run(self):
         self.canceled = False
 
@@ -251,41 +857,96 @@ class YtbDl(QThread):
             self.output_path = os.path.dirname(sys.argv[0])
 
         self.total_len = len(self.url_list)
-        
-        for i, url in enumerate(self.url_list):
+        self.job_index = 0
+        self.completion_times = []
+        self.completion_order = []
+        self.plans = []
+        self.imports = []
+        self.skipped = []
+        self.skipped_len = 0
+        self.job_sizes = {}
+        self.total_bytes = 0
+        self.remaining_bytes = 0
+        self.start_time = time.time()
+
+        self.estimate_jobs(self.url_list, self.ytb_info)
+
+        self.prog_signal.emit({
+            "title": "please wait...",
+            "entry": "",
+            "size": self.get_size_info(),
+            "per": 0,
+        })
+
+        self.run_jobs(self.url_list, self.ytb_info)
+
+        seen = set(YtbImport.normalize(url) or url for url in self.url_list)
+
+        for path in self.import_paths:
+            ytb_import = YtbImport(path, seen)
+            self.imports.append(ytb_import)
+
+            batches = iter(ytb_import)
+
+            while not self.canceled:
+                try:
+                    batch = next(batches)
+                except StopIteration:
+                    break
+                except OSError:
+                    self.error.append(path)
+                    break
+
+                ytb_info = {}
+                for url in batch:
+                    ytb_info[url] = YtbInfo(url, self.get_known_ids(url))
+
+                for info in ytb_info.values():
+                    info.wait()
+
+                self.total_len += len(batch)
+                self.estimate_jobs(batch, ytb_info)
+                self.run_jobs(batch, ytb_info)
+
+            if self.canceled:
+                return
+
+    def run_jobs(self, url_list, ytb_info):
+        fifo_offset = self.job_index
+
+        for url in self.schedule_jobs(url_list, ytb_info):
             if self.canceled:
                 return
 
-            title = self.ytb_info[url].title
+            self.job_index += 1
+            title = ytb_info[url].title
 
             if not title:
                 self.error.append(url)
                 continue
 
-            self.title_info = "{} (of {})  {:.100}".format(i + 1, self.total_len, title)
+            self.title_info = "{} (of {})  {:.100}".format(self.job_index, self.total_len, title)
             self.entry_info = ""
 
-            ext_url = self.ytb_info[url].ext_url
+            ext_url = ytb_info[url].ext_url
+            sizes = self.job_sizes[url]
 
             self.opts["outtmpl"] = os.path.join(self.output_path, "%(title).100s.%(ext)s")
             
-            if self.ytb_info[url].id or (not ext_url):
-                try:
-                    with yt_dlp.YoutubeDL(self.opts) as ydl:
-                        ydl.download([url])
-                except:
-                    self.opts["format"] = "best"
-                    with yt_dlp.YoutubeDL(self.opts) as ydl:
-                        ydl.download([url])
+            if ytb_info[url].id or (not ext_url):
+                if not self.download_admitted(url, sizes[0]):
+                    self.skipped_len += 1
+                    continue
 
             else:
-                entry_len = len(self.ytb_info[url].entry_ids)
+                entry_len = len(ytb_info[url].entry_ids)
+                admitted = True
 
-                for j, entry_id in enumerate(self.ytb_info[url].entry_ids):
+                for j, entry_id in enumerate(ytb_info[url].entry_ids):
                     if self.canceled:
                         return
 
-                    entry = self.ytb_info[url].entry_titles[j]
+                    entry = ytb_info[url].entry_titles[j]
                     self.entry_info = "{} (of {})  {:.100}".format(j + 1, entry_len, entry)
 
                     try:
@@ -299,24 +960,93 @@ class YtbDl(QThread):
                     else:
                         self.opts["outtmpl"] = os.path.join(entry_path, "%(title).100s.%(ext)s")
 
-                    try:
-                        with yt_dlp.YoutubeDL(self.opts) as ydl:
-                            ydl.download([ext_url + entry_id])
-                    except:
-                        self.opts["format"] = "best"
-                        with yt_dlp.YoutubeDL(self.opts) as ydl:
-                            ydl.download([ext_url + entry_id])
+                    if not self.download_admitted(ext_url + entry_id, sizes[j]):
+                        admitted = False
+
+                if admitted:
+                    self.update_sync_state(url, ytb_info[url])
+
+            self.completion_times.append(time.time() - self.start_time)
+            self.completion_order.append(fifo_offset + url_list.index(url))
 
     def hook(self, data):
         if data["status"] == "downloading":
+            total_bytes = data.get("total_bytes") or data.get("total_bytes_estimate")
+
+            if not total_bytes:
+                return
+
             info = {
                 "title": self.title_info,
                 "entry": self.entry_info,
-                "per": round(data["downloaded_bytes"]/data["total_bytes"]*100, 2),
+                "size": self.get_size_info(data["downloaded_bytes"]),
+                "per": round(data["downloaded_bytes"]/total_bytes*100, 2),
             }
 
             self.prog_signal.emit(info)
 
+    def pp_hook(self, data):
+        if data["status"] == "started":
+            self.pp_start = time.time()
+
+        elif data["status"] == "finished":
+            self.pp_time += time.time() - self.pp_start
+
+    def report(self):
+        total_len = self.total_len
+        error_len = len(self.error)
+
+        msg = "{} (of {}) URL(s)".format(total_len - error_len - self.skipped_len, total_len)
+        msg = "::: Download Completed :::\n{}".format(msg)
+
+        mean_time = self.mean_completion_time()
+        if mean_time is not None:
+            msg += "\nmean completion time: {:.1f}s ({}), {:.1f}s (fifo replay)".format(
+                mean_time, self.schedule, self.fifo_mean_completion_time()
+            )
+
+        if self.plans:
+            actions = [plan["action"] for plan in self.plans]
+            msg += "\ndirect: {}  copy: {}  transcode: {}".format(
+                actions.count("direct"), actions.count("copy"), actions.count("transcode")
+            )
+            msg += "\nffmpeg cpu time: {:.1f}s (saved ~{:.1f}s)".format(
+                sum(plan["cpu"] for plan in self.plans), self.cpu_time_saved()
+            )
+
+        if self.total_bytes:
+            msg += "\nestimated size: ~{}".format(YtbDl.format_bytes(self.total_bytes))
+
+        for ytb_import in self.imports:
+            msg += "\nimported: {}  (invalid: {}, duplicate: {})  {}".format(
+                ytb_import.count, ytb_import.invalid, ytb_import.duplicate,
+                os.path.basename(ytb_import.path)
+            )
+
+        if self.plans:
+            plans = "\n".join(
+                "[{}] {:.100}  (cpu {:.1f}s)".format(plan["action"], plan["title"], plan["cpu"])
+                for plan in self.plans
+            )
+            msg += "\n"*2 + "::: Post-processing :::\n{}".format(plans)
+
+        error = ""
+
+        if self.error:
+            error = "\n".join(self.error)
+            error = "::: Error :::\n{}".format(error)
+
+            if total_len == error_len:
+                msg = ""
+            else:
+                error = "\n"*2 + error
+
+        if self.skipped:
+            skipped = "\n".join(self.skipped)
+            error += "\n"*2 + "::: Skipped :::\n{}".format(skipped)
+
+        return msg + error + "\n"
+
 
 class CustomProgressDialog(QProgressDialog):
 
@@ -411,6 +1141,9 @@ class YtbDlUi(QWidget):
         self.download_btn = QPushButton("download")
         self.download_btn.setFixedHeight(32)
 
+        self.import_btn = QPushButton("import...")
+        self.import_btn.setFixedSize(100, 32)
+
         self.path_le = QLineEdit()
 
         self.file_dialog_btn = QPushButton("...")
@@ -433,6 +1166,17 @@ class YtbDlUi(QWidget):
         self.hdr_chb = QCheckBox("HDR")
         self.hdr_chb.setObjectName("hdr")
 
+        self.schedule_cb = QComboBox()
+        self.schedule_cb.addItems(YtbDl.SCHEDULE)
+
+        self.sync_chb = QCheckBox("Sync")
+        self.sync_chb.setToolTip("download only entries added since the last sync")
+
+        self.reserve_sb = QSpinBox()
+        self.reserve_sb.setRange(0, 1024)
+        self.reserve_sb.setSuffix(" GB")
+        self.reserve_sb.setToolTip("free space to keep on the output volume")
+
         # LAYOUT
         path_layout = QHBoxLayout()
         path_layout.addWidget(QLabel("Save to"))
@@ -440,6 +1184,24 @@ class YtbDlUi(QWidget):
         path_layout.addWidget(self.file_dialog_btn)
         path_layout.setSpacing(3)
 
+        schedule_layout = QHBoxLayout()
+        schedule_layout.addWidget(QLabel("Queue"))
+        schedule_layout.addWidget(self.schedule_cb)
+        schedule_layout.setSpacing(3)
+
+        reserve_layout = QHBoxLayout()
+        reserve_layout.addWidget(QLabel("Reserve"))
+        reserve_layout.addWidget(self.reserve_sb)
+        reserve_layout.setSpacing(3)
+
+        queue_layout = QHBoxLayout()
+        queue_layout.setContentsMargins(3, 0, 0, 0)
+        queue_layout.setSpacing(12)
+        queue_layout.addLayout(schedule_layout)
+        queue_layout.addLayout(reserve_layout)
+        queue_layout.addWidget(self.sync_chb)
+        queue_layout.addStretch()
+
         format_layout = QHBoxLayout()
         format_layout.addWidget(QLabel("Format"))
         format_layout.addWidget(self.format_cb)
@@ -479,19 +1241,29 @@ class YtbDlUi(QWidget):
         options_layout.addLayout(hdr_layout)
         options_layout.addStretch()
 
+        download_layout = QHBoxLayout()
+        download_layout.addWidget(self.download_btn)
+        download_layout.addWidget(self.import_btn)
+        download_layout.setSpacing(3)
+
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(8, 8, 8, 8)
         main_layout.setSpacing(7)
         main_layout.addWidget(self.text_edit)
-        main_layout.addWidget(self.download_btn)
+        main_layout.addLayout(download_layout)
         main_layout.addLayout(path_layout)
         main_layout.addLayout(options_layout)
+        main_layout.addLayout(queue_layout)
 
         # CONNECTION
         self.text_edit.textChanged.connect(self.on_text_edit_changed)
         self.download_btn.clicked.connect(self.on_download_btn_clicked)
+        self.import_btn.clicked.connect(self.on_import_btn_clicked)
         self.file_dialog_btn.clicked.connect(self.on_file_dialog_btn_clicked)
         self.path_le.textChanged.connect(self.on_path_le_changed)
+        self.schedule_cb.currentTextChanged.connect(self.on_schedule_changed)
+        self.sync_chb.stateChanged.connect(self.on_sync_changed)
+        self.reserve_sb.valueChanged.connect(self.on_reserve_changed)
 
         self.options_signals = [
             self.format_cb.currentTextChanged,
@@ -531,11 +1303,26 @@ class YtbDlUi(QWidget):
         self.settings.setValue("options", self.options)
 
     def on_text_edit_changed(self):
-        url_list = self.text_edit.toPlainText().split()
+        url_list = []
+        pinned = []
+
+        for url in self.text_edit.toPlainText().split():
+            if url.startswith(YtbDl.PIN_MARK):
+                url = url.lstrip(YtbDl.PIN_MARK)
+                pinned.append(url)
+
+            if url:
+                url_list.append(url)
+
+        self.ytb_dl.pinned = pinned
         self.ytb_dl.set_ytb_info(url_list)
 
+    def on_schedule_changed(self, text):
+        self.ytb_dl.schedule = text
+        self.settings.setValue("schedule", text)
+
     def on_download_btn_clicked(self):
-        if not self.ytb_dl.url_list:
+        if not (self.ytb_dl.url_list or self.ytb_dl.import_paths):
             return
 
         info = {
@@ -554,6 +1341,28 @@ class YtbDlUi(QWidget):
 
         self.ytb_dl.start()
 
+    def on_sync_changed(self, state):
+        self.ytb_dl.set_sync(bool(state))
+        self.settings.setValue("sync", state)
+
+    def on_reserve_changed(self, value):
+        self.ytb_dl.reserve = value * 1024**3
+        self.settings.setValue("reserve", value)
+
+    def on_import_btn_clicked(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Import URLs", self.settings.value("import_path", ""),
+            "URL lists (*.txt *.csv *.jsonl *.ndjson);;All files (*)"
+        )
+
+        self.ytb_dl.import_paths = paths
+
+        if paths:
+            self.settings.setValue("import_path", os.path.dirname(paths[0]))
+            self.import_btn.setText("import ({})".format(len(paths)))
+        else:
+            self.import_btn.setText("import...")
+
     def on_file_dialog_btn_clicked(self):
         path = QFileDialog.getExistingDirectory(
             self, "Open Directory", self.settings.value("output_path")
@@ -581,6 +1390,16 @@ class YtbDlUi(QWidget):
         output_path = self.settings.value("output_path", os.path.dirname(sys.argv[0]))
         self.path_le.setText(output_path)
 
+        schedule = self.settings.value("schedule", YtbDl.SCHEDULE[0])
+        self.schedule_cb.setCurrentText(schedule)
+        self.ytb_dl.schedule = self.schedule_cb.currentText()
+
+        self.ytb_dl.sync_state = load_sync_state(self.settings)
+        self.sync_chb.setChecked(int(self.settings.value("sync", 0)))
+
+        self.reserve_sb.setValue(int(self.settings.value("reserve", 1)))
+        self.ytb_dl.reserve = self.reserve_sb.value() * 1024**3
+
         default_options = {
             "output_format": "default",
             "default": {
@@ -692,7 +1511,7 @@ class YtbDlUi(QWidget):
             self.prog_label.setAlignment(Qt.AlignVCenter | Qt.AlignHCenter)
             self.progress.setRange(0, 0)
         else:
-            text = "{}\n{}".format(info["title"], info["entry"])
+            text = "{}\n{}\n{}".format(info["title"], info["entry"], info["size"])
             self.progress.setLabelText(text)
             self.prog_label.setAlignment(Qt.AlignVCenter)
             self.progress.setRange(0, 100)
@@ -707,28 +1526,16 @@ class YtbDlUi(QWidget):
     def on_thread_finished(self):
         self.progress.close()
 
+        save_sync_state(self.settings, self.ytb_dl.sync_state)
+
         if not self.ytb_dl.canceled:
             self.text_edit.clear()
+            self.ytb_dl.import_paths = []
+            self.import_btn.setText("import...")
             self.show_info_dialog()
 
     def show_info_dialog(self):
-        total_len = self.ytb_dl.total_len
-        error_len = len(self.ytb_dl.error)
-
-        msg = "{} (of {}) URL(s)".format(total_len - error_len, total_len)
-        msg = "::: Download Completed :::\n{}".format(msg)
-        error = ""
-
-        if self.ytb_dl.error:
-            error = "\n".join(self.ytb_dl.error)
-            error = "::: Error :::\n{}".format(error)
-
-            if total_len == error_len:
-                msg = ""
-            else:
-                error = "\n"*2 + error
-
-        text = msg + error + "\n"
+        text = self.ytb_dl.report()
 
         self.ytb_dl.error = []
 
@@ -747,9 +1554,88 @@ class YtbDlUi(QWidget):
         self.settings.setValue("temp", getattr(sys, "_MEIPASS", ""))
 
 
+def load_sync_state(settings):
+    try:
+        return json.loads(settings.value("sync_state", "{}"))
+    except (TypeError, ValueError):
+        return {}
+
+
+def save_sync_state(settings, sync_state):
+    settings.setValue("sync_state", json.dumps(sync_state))
+
+
+def print_progress(info):
+    print("\r{}  {}  {}  {:6.2f}%".format(info["title"], info["entry"], info["size"], info["per"]),
+          end="")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="youtubedlui")
+    parser.add_argument("urls", nargs="*", metavar="URL")
+    parser.add_argument("-o", "--output", default=os.curdir)
+    parser.add_argument("-f", "--format", choices=YtbDl.OUTPUT_FORMAT, default="default")
+    parser.add_argument("--video", choices=YtbDl.VIDEO, default="mp4")
+    parser.add_argument("--audio", choices=YtbDl.AUDIO, default="m4a")
+    parser.add_argument("--resolution", choices=YtbDl.RESOLUTION, default="1080p")
+    parser.add_argument("--hdr", action="store_true")
+    parser.add_argument("--schedule", choices=YtbDl.SCHEDULE)
+    parser.add_argument("--pin", action="append", default=[], metavar="URL")
+    parser.add_argument("-i", "--import", dest="imports", action="append", default=[],
+                        metavar="FILE")
+    parser.add_argument("--sync", action="store_true")
+    parser.add_argument("--reserve", type=float, default=1, metavar="GB")
+    args = parser.parse_args()
+
+    if not (args.urls or args.pin or args.imports):
+        app = QApplication(sys.argv[:1])
+        app.setStyle("Fusion")
+        ytb_dl_ui = YtbDlUi()
+        if args.schedule:
+            ytb_dl_ui.schedule_cb.blockSignals(True)
+            ytb_dl_ui.schedule_cb.setCurrentText(args.schedule)
+            ytb_dl_ui.schedule_cb.blockSignals(False)
+            ytb_dl_ui.ytb_dl.schedule = args.schedule
+        ytb_dl_ui.show()
+        return app.exec_()
+
+    print("{} v{}".format(YtbDlUi.TITLE, YtbDl.VERSION), end="\n"*3)
+
+    url_list = args.urls + [url for url in args.pin if url not in args.urls]
+
+    info = {
+        "output_format": args.format,
+        "audio": args.audio,
+    }
+
+    if args.format != "audio_only":
+        info["video"] = args.video
+        info["width"] = YtbDl.WIDTH[args.resolution]
+        info["hdr"] = args.hdr
+
+    ytb_dl = YtbDl()
+    ytb_dl.output_path = args.output
+    ytb_dl.schedule = args.schedule or YtbDl.SCHEDULE[0]
+    ytb_dl.pinned = args.pin
+    ytb_dl.import_paths = args.imports
+    ytb_dl.reserve = int(args.reserve * 1024**3)
+    ytb_dl.prog_signal.connect(print_progress)
+
+    settings = QSettings("abc11010xyz", "youtubedlui")
+    ytb_dl.sync = args.sync
+    ytb_dl.sync_state = load_sync_state(settings)
+
+    ytb_dl.set_ytb_info(url_list)
+    ytb_dl.set_opts(**info)
+
+    try:
+        ytb_dl.run()
+    finally:
+        save_sync_state(settings, ytb_dl.sync_state)
+
+    print("\n"*2 + ytb_dl.report())
+    return 0
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")
-    ytb_dl_ui = YtbDlUi()
-    ytb_dl_ui.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file